@@ -0,0 +1,239 @@
+# Teste de carga com sessões concorrentes do jard.py
+#
+# Cada usuário simulado é uma sessão do AppTest do Streamlit executando o mesmo
+# roteiro de um supervisor: enviar o CSV de cortes, mover o slider de dias,
+# editar a configuração de uma área e filtrar o histórico. O AppTest usa um
+# Runtime global e não pode rodar em várias threads, então cada usuário
+# simultâneo é um processo separado disputando a mesma CPU. Não há um servidor
+# compartilhado: o tempo de rerun reflete a disputa por CPU, mas a memória
+# medida é a de cada processo com seu próprio Runtime, não a de um servidor
+# Streamlit atendendo todas as sessões.
+#
+# O teste roda num site temporário com o número de áreas pedido em --areas.
+#
+# Uso:
+#     python carga_sessoes.py --usuarios 1 4 8 --repeticoes 3
+import argparse
+import ast
+import json
+import logging
+import math
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+
+import matplotlib
+matplotlib.use("Agg")
+import numpy as np
+import pandas as pd
+from streamlit.testing.v1 import AppTest
+
+APP = os.path.join(os.path.dirname(os.path.abspath(__file__)), "jard.py")
+ETAPAS = [
+    "abrir_app", "upload_csv", "slider_min_dias", "abrir_configuracao",
+    "editar_area", "abrir_historico", "upload_historico", "filtro_historico"
+]
+SITE_CARGA = "carga"
+CENTRO_CARGA = [-22.4882, -44.5424]
+
+# Constantes lidas do jard.py sem executá-lo (importar o app roda o Streamlit)
+def constante_do_app(nome):
+    with open(APP, "r") as f:
+        arvore = ast.parse(f.read())
+    for no in arvore.body:
+        if isinstance(no, ast.Assign) and any(getattr(alvo, "id", None) == nome for alvo in no.targets):
+            return ast.literal_eval(no.value)
+    raise KeyError(nome)
+
+AREAS_POR_PAGINA = constante_do_app("AREAS_POR_PAGINA")
+LIMIAR_CRESCIMENTO_PADRAO = constante_do_app("LIMIAR_CRESCIMENTO_PADRAO")
+
+# Site com num_areas áreas em grade ao redor do centro, no formato de sites/<id>/
+def criar_site_carga(diretorio, num_areas):
+    pasta = os.path.join(diretorio, "sites", SITE_CARGA)
+    os.makedirs(pasta)
+    lado = 0.0005
+    colunas = math.ceil(math.sqrt(num_areas))
+    geometria = []
+    for n in range(num_areas):
+        lat = CENTRO_CARGA[0] + (n // colunas - colunas / 2) * lado
+        lon = CENTRO_CARGA[1] + (n % colunas - colunas / 2) * lado
+        d = lado * 0.9
+        geometria.append({
+            "area": n + 1,
+            "coordenadas": [[lat, lon], [lat + d, lon], [lat + d, lon + d], [lat, lon + d]]
+        })
+    areas = [{
+        "nome": f"Área {n + 1}",
+        "maquina": "Trator",
+        "periodo_chuvoso": 30,
+        "periodo_seco": 60,
+        "limiar_crescimento": LIMIAR_CRESCIMENTO_PADRAO
+    } for n in range(num_areas)]
+    arquivos = {
+        "site.json": {"nome": "Teste de carga", "centro": CENTRO_CARGA, "zoom": 16},
+        "areas.json": areas,
+        "geometria.json": geometria
+    }
+    for arquivo, conteudo in arquivos.items():
+        with open(os.path.join(pasta, arquivo), "w") as f:
+            json.dump(conteudo, f)
+
+# Gera um histórico sintético com vários cortes por área
+def gerar_historico(num_areas, cortes_por_area, formato, seed):
+    rng = random.Random(seed)
+    hoje = datetime.now().date()
+    linhas = []
+    for area in range(1, num_areas + 1):
+        for _ in range(cortes_por_area):
+            data = hoje - timedelta(days=rng.randint(0, 365))
+            linhas.append({"area": area, "data_corte": data.strftime(formato)})
+    return pd.DataFrame(linhas).to_csv(index=False).encode()
+
+def cronometrar(tempos, etapa, acao):
+    inicio = time.perf_counter()
+    at = acao()
+    tempos[etapa] = time.perf_counter() - inicio
+    if at.exception:
+        raise RuntimeError(f"Erro na etapa {etapa}: {at.exception[0].message}")
+    return at
+
+# Roteiro de uma sessão de supervisor
+def roteiro(at, tempos, rng, csv_mapa, csv_historico):
+    at = cronometrar(tempos, "abrir_app", at.run)
+    at = cronometrar(tempos, "upload_csv", lambda: at.file_uploader[0].set_value(
+        ("cortes.csv", csv_mapa, "text/csv")).run())
+    at = cronometrar(tempos, "slider_min_dias", lambda: at.slider[0].set_value(
+        rng.randint(0, 60)).run())
+
+    at = cronometrar(tempos, "abrir_configuracao", lambda: at.sidebar.radio[0].set_value(
+        "Configuração").run())
+    site_id = at.session_state["site_id"]
+    # Áreas visíveis na primeira página da configuração
+    i = rng.randrange(min(len(at.session_state["area_info"]), AREAS_POR_PAGINA))
+    at.text_input(key=f"nome_{site_id}_{i}").set_value(f"Área {i + 1} (editada)")
+    at = cronometrar(tempos, "editar_area", lambda: at.number_input(key=f"chuvoso_{site_id}_{i}").set_value(
+        rng.randint(15, 45)).run())
+
+    at = cronometrar(tempos, "abrir_historico", lambda: at.sidebar.radio[0].set_value(
+        "Histórico de Cortes").run())
+    at = cronometrar(tempos, "upload_historico", lambda: at.file_uploader[0].set_value(
+        ("historico.csv", csv_historico, "text/csv")).run())
+    areas = at.multiselect[0].options
+    cronometrar(tempos, "filtro_historico", lambda: at.multiselect[0].set_value(
+        rng.sample(areas, max(1, len(areas) // 3))).run())
+
+# Executada em um processo do pool; as etapas concluídas são devolvidas
+# mesmo quando a sessão falha no meio do roteiro
+def simular_sessao(csv_mapa, csv_historico, timeout, seed):
+    warnings.simplefilter("ignore")
+    logging.disable(logging.WARNING)
+    tempos = {}
+    erro = None
+    # O AppTest troca o módulo __main__ pelo jard.py; sem restaurá-lo o processo
+    # não encontra simular_sessao para as próximas sessões
+    main = sys.modules["__main__"]
+    try:
+        at = AppTest.from_file(APP, default_timeout=timeout)
+        roteiro(at, tempos, random.Random(seed), csv_mapa, csv_historico)
+    except Exception as e:
+        erro = f"{type(e).__name__}: {e}"
+    finally:
+        sys.modules["__main__"] = main
+    pico_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return tempos, erro, os.getpid(), pico_mb
+
+def executar_nivel(usuarios, repeticoes, csv_mapa, csv_historico, timeout, seed):
+    tempos = {etapa: [] for etapa in ETAPAS}
+    erros = []
+    picos = {}
+    inicio = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=usuarios) as executor:
+        futuros = [
+            executor.submit(simular_sessao, csv_mapa, csv_historico, timeout, seed + n)
+            for n in range(usuarios * repeticoes)
+        ]
+        for futuro in futuros:
+            tempos_sessao, erro, pid, pico_mb = futuro.result()
+            for etapa, valor in tempos_sessao.items():
+                tempos[etapa].append(valor)
+            if erro:
+                erros.append(erro)
+            picos[pid] = max(picos.get(pid, 0), pico_mb)
+    duracao = time.perf_counter() - inicio
+    return tempos, picos, duracao, erros
+
+def percentis_ms(valores):
+    if not valores:
+        return float("nan"), float("nan")
+    p50, p95 = np.percentile(valores, [50, 95])
+    return p50 * 1000, p95 * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description="Teste de carga com sessões concorrentes do jard.py")
+    parser.add_argument("--usuarios", type=int, nargs="+", default=[1, 4, 8],
+                        help="níveis de usuários simultâneos")
+    parser.add_argument("--repeticoes", type=int, default=2,
+                        help="sessões por usuário em cada nível")
+    parser.add_argument("--areas", type=int, default=35,
+                        help="áreas do site temporário e do CSV de cortes")
+    parser.add_argument("--cortes-por-area", type=int, default=12)
+    parser.add_argument("--timeout", type=float, default=120,
+                        help="tempo máximo de cada rerun (s)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    # A mesma série de cortes nos dois formatos lidos pelo app
+    # (o mapa lê datas ISO e o histórico lê dia/mês/ano)
+    csv_mapa = gerar_historico(args.areas, args.cortes_por_area, "%Y-%m-%d", args.seed)
+    csv_historico = gerar_historico(args.areas, args.cortes_por_area, "%d/%m/%Y", args.seed)
+
+    # A página de configuração grava os arquivos dos sites no diretório atual;
+    # rodamos num diretório temporário com apenas o site de carga, que o app
+    # seleciona por padrão, para não alterar a configuração real.
+    diretorio_original = os.getcwd()
+    resultados = {}
+    with tempfile.TemporaryDirectory() as diretorio:
+        criar_site_carga(diretorio, args.areas)
+        os.chdir(diretorio)
+        try:
+            for usuarios in args.usuarios:
+                tempos, picos, duracao, erros = executar_nivel(
+                    usuarios, args.repeticoes, csv_mapa, csv_historico, args.timeout, args.seed
+                )
+                resultados[usuarios] = tempos
+                print(f"\n=== {usuarios} usuário(s) simultâneo(s): {usuarios * args.repeticoes} sessões "
+                      f"em {duracao:.1f} s, {len(erros)} erro(s)")
+                # Memória de cada processo do AppTest, não de um servidor compartilhado
+                print(f"  Pico de RSS por processo de sessão: {max(picos.values()):.0f} MB "
+                      f"(máximo entre {len(picos)} processos; não é a memória de um servidor)")
+                for erro in sorted(set(erros)):
+                    print(f"  ! {erro}")
+                print(f"  {'Etapa':<20}{'p50 (ms)':>10}{'p95 (ms)':>10}")
+                for etapa in ETAPAS:
+                    p50, p95 = percentis_ms(tempos[etapa])
+                    print(f"  {etapa:<20}{p50:>10.0f}{p95:>10.0f}")
+        finally:
+            os.chdir(diretorio_original)
+
+    # Etapas que mais degradam entre o menor e o maior nível de carga
+    menor, maior = min(resultados), max(resultados)
+    if menor != maior:
+        degradacao = []
+        for etapa in ETAPAS:
+            base = percentis_ms(resultados[menor][etapa])[1]
+            carga = percentis_ms(resultados[maior][etapa])[1]
+            if base > 0:
+                degradacao.append((carga / base, etapa, base, carga))
+        print(f"\n=== Degradação do p95 de {menor} para {maior} usuário(s)")
+        for fator, etapa, base, carga in sorted(degradacao, reverse=True):
+            print(f"  {etapa:<20}{base:>8.0f} ms -> {carga:>8.0f} ms  ({fator:.1f}x)")
+
+if __name__ == "__main__":
+    main()
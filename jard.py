@@ -3,22 +3,14 @@ import folium
 from datetime import datetime
 from branca.element import Template, MacroElement
 import pandas as pd
+import numpy as np
 import io
 from streamlit_folium import folium_static
 import json
 import os
+import re
 import matplotlib.pyplot as plt
 
-def load_area_config():
-    if os.path.exists("area_config.json"):
-        with open("area_config.json", "r") as f:
-            return json.load(f)
-    return None
-
-def save_area_config(config):
-    with open("area_config.json", "w") as f:
-        json.dump(config, f, indent=4)
-
 # Função para converter mês em português para número
 def mes_para_numero(mes):
     meses_pt = {
@@ -28,27 +20,223 @@ def mes_para_numero(mes):
     }
     return meses_pt[mes]
 
+# Modelo de crescimento acumulado por chuva e temperatura
+MODELO_MESES = "Meses chuvosos"
+MODELO_CRESCIMENTO = "Crescimento acumulado (chuva e temperatura)"
+TEMP_BASE_CRESCIMENTO = 10.0  # °C abaixo dos quais a vegetação não cresce
+CHUVA_REFERENCIA_7D = 25.0  # mm em 7 dias para crescimento sem restrição hídrica
+LIMIAR_CRESCIMENTO_PADRAO = 450
+TOLERANCIA_CLIMA_DIAS = 3  # atraso aceito entre o último dia da série e a data de referência
+
+def carregar_clima(arquivo):
+    clima = pd.read_csv(arquivo)
+    if not {"data", "chuva_mm", "temp_media"}.issubset(clima.columns):
+        return None
+    clima["data"] = pd.to_datetime(clima["data"], errors="coerce")
+    for coluna in ["chuva_mm", "temp_media"]:
+        clima[coluna] = pd.to_numeric(clima[coluna], errors="coerce")
+    clima = clima.dropna(subset=["data", "chuva_mm", "temp_media"])
+    if clima.empty:
+        return None
+    # Datas repetidas contariam o mesmo dia duas vezes na soma acumulada
+    clima = clima.drop_duplicates(subset="data", keep="last")
+    return clima.sort_values("data").reset_index(drop=True)
+
+def indice_crescimento(clima, datas_corte, data_ref=None):
+    # Graus-dia acima da temperatura base, limitados pela chuva dos últimos 7 dias.
+    # A soma acumulada permite obter o índice de todas as áreas com um único searchsorted.
+    if data_ref is None:
+        data_ref = datetime.now().date()
+    chuva_7d = clima["chuva_mm"].rolling(7, min_periods=1).sum()
+    fator_hidrico = (chuva_7d / CHUVA_REFERENCIA_7D).clip(upper=1.0)
+    graus_dia = (clima["temp_media"] - TEMP_BASE_CRESCIMENTO).clip(lower=0.0)
+    acumulado = np.concatenate([[0.0], np.cumsum((graus_dia * fator_hidrico).to_numpy())])
+
+    datas = clima["data"].to_numpy(dtype="datetime64[ns]")
+    cortes = pd.to_datetime(pd.Series(datas_corte)).to_numpy(dtype="datetime64[ns]")
+    inicio = np.searchsorted(datas, cortes, side="right")
+    fim = np.searchsorted(datas, np.datetime64(pd.Timestamp(data_ref), "ns"), side="right")
+    return np.clip(acumulado[fim] - acumulado[np.minimum(inicio, fim)], 0.0, None)
+
+# True para os cortes cujo intervalo até a data de referência está coberto pela série;
+# fora dela o índice seria subestimado e o status deve vir dos meses chuvosos
+def cobertura_clima(clima, datas_corte, data_ref=None):
+    if data_ref is None:
+        data_ref = datetime.now().date()
+    cortes = pd.to_datetime(pd.Series(datas_corte)).to_numpy(dtype="datetime64[ns]")
+    inicio_coberto = cortes >= clima["data"].min().to_datetime64()
+    fim_coberto = pd.Timestamp(data_ref) - clima["data"].max() <= pd.Timedelta(days=TOLERANCIA_CLIMA_DIAS)
+    return inicio_coberto & fim_coberto
+
+def modelo_crescimento_ativo(clima):
+    return st.session_state.modelo_periodicidade == MODELO_CRESCIMENTO and clima is not None
+
+# Cada site fica em sites/<id>/ com site.json (nome, centro e zoom do mapa),
+# areas.json (tabela de áreas), geometria.json (polígonos), historico.csv
+# (partição do histórico de cortes), clima.csv (série diária de chuva e
+# temperatura) e resumo.json (estatísticas pré-agregadas)
+SITES_DIR = "sites"
+SITE_PADRAO = "principal"
+NUM_AREAS_PADRAO = 35
+AREAS_POR_PAGINA = 50
+
+def caminho_site(site_id, arquivo):
+    return os.path.join(SITES_DIR, site_id, arquivo)
+
+def listar_sites():
+    if not os.path.isdir(SITES_DIR):
+        return []
+    return sorted(s for s in os.listdir(SITES_DIR) if os.path.exists(caminho_site(s, "site.json")))
+
+# Os arquivos são lidos só quando o site é usado e ficam em cache entre as
+# sessões; a data de modificação faz parte da chave para invalidar o cache,
+# e max_entries descarta as versões antigas
+@st.cache_data(max_entries=500)
+def ler_json(caminho, modificado_em):
+    with open(caminho, "r") as f:
+        return json.load(f)
+
+def carregar_json_site(site_id, arquivo):
+    caminho = caminho_site(site_id, arquivo)
+    if not os.path.exists(caminho):
+        return None
+    return ler_json(caminho, os.path.getmtime(caminho))
+
+# Polígono no formato {"area": int, "coordenadas": [[lat, lon], ...]}
+def poligono_valido(g):
+    if not isinstance(g, dict) or type(g.get("area")) is not int:
+        return False
+    coordenadas = g.get("coordenadas")
+    return isinstance(coordenadas, list) and len(coordenadas) >= 3 and all(
+        isinstance(p, list) and len(p) == 2
+        and all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in p)
+        for p in coordenadas
+    )
+
+# Compartilhada entre as sessões sem cópia; não deve ser alterada.
+# Devolve os polígonos válidos e a quantidade de entradas ignoradas.
+@st.cache_resource(max_entries=20)
+def ler_geometria(caminho, modificado_em):
+    try:
+        with open(caminho, "r") as f:
+            dados = json.load(f)
+    except ValueError:
+        return {}, 1
+    if not isinstance(dados, list):
+        return {}, 1
+    validos = [g for g in dados if poligono_valido(g)]
+    return {g["area"]: g["coordenadas"] for g in validos}, len(dados) - len(validos)
+
+def carregar_geometria(site_id):
+    caminho = caminho_site(site_id, "geometria.json")
+    if not os.path.exists(caminho):
+        return {}
+    geometria, ignorados = ler_geometria(caminho, os.path.getmtime(caminho))
+    if ignorados:
+        st.warning(f"{ignorados} entrada(s) inválida(s) em {caminho} foram ignoradas.")
+    return geometria
+
+def centro_geometria(geometria):
+    pontos = [p for coords in geometria.values() for p in coords]
+    if not pontos:
+        return [-22.4882, -44.5424]
+    return np.mean(pontos, axis=0).tolist()
+
+def nova_area(i):
+    return {
+        "nome": f"Área {i+1}",
+        "maquina": "Trator",
+        "periodo_chuvoso": 30,
+        "periodo_seco": 60,
+        "limiar_crescimento": LIMIAR_CRESCIMENTO_PADRAO
+    }
+
+def load_area_config(site_id):
+    return carregar_json_site(site_id, "areas.json")
+
+def save_area_config(site_id, config):
+    with open(caminho_site(site_id, "areas.json"), "w") as f:
+        json.dump(config, f, indent=4)
+    atualizar_resumo(site_id, config)
+
+# Coluna area como inteiro; linhas sem número de área válido são descartadas
+def normalizar_areas(df):
+    df = df.assign(area=pd.to_numeric(df["area"], errors="coerce"))
+    df = df[df["area"].notna() & (df["area"] % 1 == 0)]
+    return df.astype({"area": "int64"})
+
+@st.cache_data(max_entries=20)
+def ler_historico(caminho, modificado_em):
+    return normalizar_areas(pd.read_csv(caminho, parse_dates=["data_corte"]))
+
+def carregar_historico(site_id):
+    caminho = caminho_site(site_id, "historico.csv")
+    if not os.path.exists(caminho):
+        return pd.DataFrame({"area": pd.Series(dtype="int64"), "data_corte": pd.Series(dtype="datetime64[ns]")})
+    return ler_historico(caminho, os.path.getmtime(caminho))
+
+@st.cache_data(max_entries=20)
+def ler_clima(caminho, modificado_em):
+    return carregar_clima(caminho)
+
+def carregar_clima_site(site_id):
+    caminho = caminho_site(site_id, "clima.csv")
+    if not os.path.exists(caminho):
+        return None
+    return ler_clima(caminho, os.path.getmtime(caminho))
+
+def salvar_clima(site_id, clima):
+    clima.to_csv(caminho_site(site_id, "clima.csv"), index=False, date_format="%Y-%m-%d")
+
+def salvar_historico(site_id, novos, area_info):
+    historico = pd.concat([carregar_historico(site_id), normalizar_areas(novos[["area", "data_corte"]])])
+    historico = historico.drop_duplicates().sort_values(["area", "data_corte"])
+    historico.to_csv(caminho_site(site_id, "historico.csv"), index=False, date_format="%Y-%m-%d")
+    atualizar_resumo(site_id, area_info, historico)
+
+# Estatísticas do site usadas no resumo entre sites, sem carregar o histórico.
+# As datas de vencimento ficam ordenadas para contar as áreas vencidas com searchsorted.
+def atualizar_resumo(site_id, area_info, historico=None):
+    if historico is None:
+        historico = carregar_historico(site_id)
+    ultimos = historico.groupby("area")["data_corte"].max()
+    ultimos = ultimos[(ultimos.index >= 1) & (ultimos.index <= len(area_info))]
+    posicoes = ultimos.index.to_numpy(dtype="int64") - 1
+    vencimentos = {}
+    for periodo in ["periodo_chuvoso", "periodo_seco"]:
+        dias = np.array([a[periodo] for a in area_info], dtype="int64")[posicoes]
+        vencimentos[periodo] = sorted((ultimos + pd.to_timedelta(dias, unit="D")).dt.strftime("%Y-%m-%d"))
+    resumo = {
+        "areas": len(area_info),
+        "areas_com_corte": len(ultimos),
+        "cortes": len(historico),
+        "ultimo_corte": historico["data_corte"].max().strftime("%Y-%m-%d") if len(historico) else None,
+        "vencimentos_chuvoso": vencimentos["periodo_chuvoso"],
+        "vencimentos_seco": vencimentos["periodo_seco"]
+    }
+    with open(caminho_site(site_id, "resumo.json"), "w") as f:
+        json.dump(resumo, f, indent=4)
+    return resumo
+
+def criar_site(site_id, nome, centro, zoom, num_areas, geometria=None):
+    os.makedirs(os.path.join(SITES_DIR, site_id), exist_ok=True)
+    with open(caminho_site(site_id, "site.json"), "w") as f:
+        json.dump({"nome": nome, "centro": centro, "zoom": zoom}, f, indent=4)
+    if geometria is not None:
+        with open(caminho_site(site_id, "geometria.json"), "w") as f:
+            json.dump(geometria, f)
+    save_area_config(site_id, [nova_area(i) for i in range(num_areas)])
+
 # Configuração inicial do Streamlit
 st.set_page_config(layout="wide")
 
 # Inicialização segura do session_state
-if "area_info" not in st.session_state:
-    area_config = load_area_config()
-    if area_config:
-        st.session_state.area_info = area_config
-    else:
-        st.session_state.area_info = [
-            {
-                "nome": f"Área {i+1}",
-                "maquina": "Trator",
-                "periodo_chuvoso": 30,
-                "periodo_seco": 60
-            } for i in range(35)
-        ]
-
 if "meses_chuvosos" not in st.session_state:
     st.session_state.meses_chuvosos = ["Janeiro", "Fevereiro", "Março", "Dezembro"]
 
+if "modelo_periodicidade" not in st.session_state:
+    st.session_state.modelo_periodicidade = MODELO_MESES
+
 if "default_color" not in st.session_state:
     st.session_state.default_color = "#90EE90"
 
@@ -77,8 +265,44 @@ def get_status(days_since_cut, chuvoso, seco):
     periodicidade = chuvoso if current_month in meses_chuvosos else seco
     return "Vencido" if days_since_cut > periodicidade else "Em dia"
 
+def limiares_crescimento(areas, area_info):
+    return np.array([
+        area_info[int(a) - 1].get("limiar_crescimento", LIMIAR_CRESCIMENTO_PADRAO)
+        if 1 <= a <= len(area_info) else LIMIAR_CRESCIMENTO_PADRAO
+        for a in areas
+    ])
+
+# Status de várias áreas de uma vez pelo modelo de crescimento (mapa e histórico)
+def status_crescimento(indices, limiares):
+    return np.where(np.asarray(indices) >= np.asarray(limiares), "Vencido", "Em dia")
+
 # Sidebar
-page = st.sidebar.radio("Navegar para:", ["Mapa", "Configuração", "Histórico de Cortes"])
+sites = listar_sites()
+if not sites:
+    criar_site(SITE_PADRAO, "Principal", [-22.4882, -44.5424], 16.45, NUM_AREAS_PADRAO)
+    sites = [SITE_PADRAO]
+
+site_id = st.sidebar.selectbox(
+    "Site", sites,
+    format_func=lambda s: carregar_json_site(s, "site.json")["nome"],
+    key="site_id"
+)
+page = st.sidebar.radio("Navegar para:", ["Mapa", "Configuração", "Histórico de Cortes", "Resumo dos Sites"])
+
+# Apenas a tabela de áreas do site selecionado fica na sessão
+if st.session_state.get("area_info_site") != site_id:
+    area_config = load_area_config(site_id)
+    if area_config:
+        st.session_state.area_info = area_config
+    else:
+        num_areas = len(carregar_geometria(site_id)) or NUM_AREAS_PADRAO
+        st.session_state.area_info = [nova_area(i) for i in range(num_areas)]
+    st.session_state.area_info_site = site_id
+    # Cópia do que está em areas.json; sem arquivo, a primeira visita à configuração o grava
+    st.session_state.area_info_salva = [dict(area) for area in area_config] if area_config else None
+
+# Série climática do site, lida do clima.csv em cache e compartilhada entre as sessões
+clima = carregar_clima_site(site_id)
 
 # Página de configuração
 if page == "Configuração":
@@ -103,12 +327,90 @@ if page == "Configuração":
         default=st.session_state.meses_chuvosos
     )
 
-    for i in range(35):
+    modelos = [MODELO_MESES, MODELO_CRESCIMENTO]
+    st.session_state.modelo_periodicidade = st.radio(
+        "Modelo de periodicidade de corte",
+        modelos,
+        index=modelos.index(st.session_state.modelo_periodicidade)
+    )
+
+    if st.session_state.modelo_periodicidade == MODELO_CRESCIMENTO:
+        st.markdown("### 🌦️ Dados diários de chuva e temperatura")
+        modelo_clima = pd.DataFrame({
+            "data": ["2025-03-01", "2025-03-02"],
+            "chuva_mm": [12.5, 0.0],
+            "temp_media": [24.3, 26.1]
+        })
+        st.download_button(
+            label="📥 Baixar modelo de CSV de clima",
+            data=modelo_clima.to_csv(index=False),
+            file_name="modelo_clima.csv",
+            mime="text/csv"
+        )
+        arquivo_clima = st.file_uploader(
+            "📤 Envie o CSV com as colunas 'data', 'chuva_mm' e 'temp_media'",
+            type="csv", key=f"clima_csv_{site_id}"
+        )
+        if arquivo_clima is not None:
+            clima_enviado = carregar_clima(arquivo_clima)
+            if clima_enviado is None:
+                st.error(
+                    "CSV de clima inválido. As colunas devem ser: 'data', 'chuva_mm' e 'temp_media', "
+                    "com pelo menos uma linha de data e valores numéricos válidos"
+                )
+            elif st.button("💾 Salvar série climática do site"):
+                salvar_clima(site_id, clima_enviado)
+                clima = carregar_clima_site(site_id)
+                st.success("Série climática salva para o site!")
+        if clima is not None:
+            st.caption(
+                f"Série climática do site: {len(clima)} dias "
+                f"({clima['data'].min():%d/%m/%Y} a {clima['data'].max():%d/%m/%Y}). "
+                "Cortes anteriores ao início da série usam os meses chuvosos."
+            )
+            atraso = (pd.Timestamp(datetime.now().date()) - clima["data"].max()).days
+            if atraso > TOLERANCIA_CLIMA_DIAS:
+                st.warning(
+                    f"A série climática termina há {atraso} dias; enquanto não for atualizada, "
+                    "o status de todas as áreas usa os meses chuvosos."
+                )
+        else:
+            st.warning("Sem dados climáticos, a periodicidade continua definida pelos meses chuvosos.")
+
+    st.markdown(f"### Áreas do site {carregar_json_site(site_id, 'site.json')['nome']}")
+    num_areas = st.number_input(
+        "Número de áreas",
+        min_value=1, max_value=10000,
+        value=len(st.session_state.area_info),
+        key=f"num_areas_{site_id}"
+    )
+    if num_areas > len(st.session_state.area_info):
+        st.session_state.area_info += [
+            nova_area(i) for i in range(len(st.session_state.area_info), num_areas)
+        ]
+    elif num_areas < len(st.session_state.area_info):
+        # Reduzir apaga as configurações das últimas áreas; só depois de confirmar
+        removidas = len(st.session_state.area_info) - num_areas
+        st.warning(
+            f"Reduzir para {num_areas} áreas apaga a configuração das áreas "
+            f"{num_areas + 1} a {len(st.session_state.area_info)}."
+        )
+        if st.button(f"🗑️ Confirmar remoção de {removidas} área(s)", key=f"remover_areas_{site_id}"):
+            del st.session_state.area_info[num_areas:]
+    num_areas = len(st.session_state.area_info)
+
+    paginas = (num_areas - 1) // AREAS_POR_PAGINA + 1
+    pagina = 1
+    if paginas > 1:
+        pagina = st.number_input("Página de áreas", min_value=1, max_value=paginas, value=1, key=f"pagina_{site_id}")
+    inicio = (pagina - 1) * AREAS_POR_PAGINA
+
+    for i in range(inicio, min(inicio + AREAS_POR_PAGINA, num_areas)):
         with st.expander(f"Configuração da Área {i+1}", expanded=False):
             st.session_state.area_info[i]["nome"] = st.text_input(
                 f"Nome da Área {i+1}",
                 value=st.session_state.area_info[i]["nome"],
-                key=f"nome_{i}"
+                key=f"nome_{site_id}_{i}"
             )
 
             st.session_state.area_info[i]["maquina"] = st.selectbox(
@@ -117,36 +419,78 @@ if page == "Configuração":
                 index=["Trator", "Girozero", "Roçadeira"].index(
                     st.session_state.area_info[i]["maquina"]
                 ),
-                key=f"maquina_{i}"
+                key=f"maquina_{site_id}_{i}"
             )
 
             st.session_state.area_info[i]["periodo_chuvoso"] = st.number_input(
                 f"Periodicidade de corte no período chuvoso (dias) - Área {i+1}",
                 min_value=1, max_value=180,
                 value=st.session_state.area_info[i]["periodo_chuvoso"],
-                key=f"chuvoso_{i}"
+                key=f"chuvoso_{site_id}_{i}"
             )
 
             st.session_state.area_info[i]["periodo_seco"] = st.number_input(
                 f"Periodicidade de corte no período seco (dias) - Área {i+1}",
                 min_value=1, max_value=180,
                 value=st.session_state.area_info[i]["periodo_seco"],
-                key=f"seco_{i}"
+                key=f"seco_{site_id}_{i}"
+            )
+
+            st.session_state.area_info[i]["limiar_crescimento"] = st.number_input(
+                f"Limiar do índice de crescimento para corte - Área {i+1}",
+                min_value=1, max_value=5000,
+                value=st.session_state.area_info[i].get("limiar_crescimento", LIMIAR_CRESCIMENTO_PADRAO),
+                key=f"limiar_{site_id}_{i}"
             )
 
-    st.success("Configurações atualizadas com sucesso!")
-    # Salvar configurações ao final da aba de configuração
-    save_area_config(st.session_state.area_info)
+    # Salvar configurações ao final da aba de configuração, apenas se algo mudou
+    if st.session_state.area_info != st.session_state.area_info_salva:
+        save_area_config(site_id, st.session_state.area_info)
+        st.session_state.area_info_salva = [dict(area) for area in st.session_state.area_info]
+        st.success("Configurações atualizadas com sucesso!")
+
+    with st.expander("➕ Cadastrar novo site", expanded=False):
+        with st.form("novo_site"):
+            novo_id = st.text_input("Identificador (letras minúsculas, números, '-' ou '_')")
+            novo_nome = st.text_input("Nome do site")
+            latitude = st.number_input("Latitude do centro do mapa", value=-22.4882, format="%.6f")
+            longitude = st.number_input("Longitude do centro do mapa", value=-44.5424, format="%.6f")
+            novo_num_areas = st.number_input("Número de áreas", min_value=1, max_value=10000, value=NUM_AREAS_PADRAO)
+            arquivo_geometria = st.file_uploader(
+                "📤 Geometria (JSON com uma lista de {'area', 'coordenadas'})", type="json"
+            )
+            if st.form_submit_button("Cadastrar site"):
+                geometria = None
+                erro = None
+                if not re.fullmatch(r"[a-z0-9_-]+", novo_id):
+                    erro = "Identificador inválido."
+                elif novo_id in sites:
+                    erro = "Já existe um site com esse identificador."
+                elif arquivo_geometria is not None:
+                    try:
+                        geometria = json.load(arquivo_geometria)
+                    except ValueError:
+                        erro = "O arquivo de geometria não é um JSON válido."
+                    else:
+                        if not isinstance(geometria, list) or not all(poligono_valido(g) for g in geometria):
+                            erro = "Geometria inválida. Use uma lista de {'area': número, 'coordenadas': [[lat, lon], ...]}."
+                if erro:
+                    st.error(erro)
+                else:
+                    criar_site(novo_id, novo_nome or novo_id, [latitude, longitude], 16, novo_num_areas, geometria)
+                    st.success(f"Site {novo_nome or novo_id} cadastrado! Selecione-o na barra lateral.")
 
 # Página do mapa
 elif page == "Mapa":
     st.title("Mapa de gestão de corte de vegetação")
 
+    area_info = st.session_state.area_info
+
     # Baixar modelo de CSV
     st.markdown("### 📄 Baixe o modelo de preenchimento:")
     modelo_df = pd.DataFrame({
-        "area": list(range(1, 36)),
-        "data_corte": ["2025-03-01"] * 35
+        "area": list(range(1, len(area_info) + 1)),
+        "data_corte": ["2025-03-01"] * len(area_info)
     })
     csv_modelo = io.StringIO()
     modelo_df.to_csv(csv_modelo, index=False)
@@ -157,558 +501,262 @@ elif page == "Mapa":
         mime="text/csv"
     )
 
-    # Upload do CSV
+    # Upload do CSV; sem upload, usa o histórico salvo do site
+    historico = carregar_historico(site_id)
     uploaded_file = st.file_uploader("📤 Envie o arquivo CSV com as datas de corte", type="csv")
+    df = None
     if uploaded_file is not None:
         df = pd.read_csv(uploaded_file)
         if "area" not in df.columns or "data_corte" not in df.columns:
             st.error("CSV inválido. As colunas devem ser: 'area' e 'data_corte'")
+            df = None
         else:
+            df = normalizar_areas(df)
             df["data_corte"] = pd.to_datetime(df["data_corte"],errors='coerce')
             if df["data_corte"].isnull().any():
                 st.warning("Algumas datas estão inválidas no CSV.")
-            else:
-                min_days = st.slider("Mostrar áreas com no mínimo X dias desde o corte", 0, st.session_state.get("max_days", 90), 0)
-
-                # Coordenadas das áreas (exemplo fictício)
-                area_coords = [
-# P1E-A
-[[-22.4892150101985, -44.53628944378521],
-[-22.488604361891028, -44.53657005393111],
-[-22.48814149209604, -44.53662076205793],
-[-22.488015963496707, -44.536512676664415],
-[-22.487838801754915, -44.53653821388996],
-[-22.487717535889715, -44.53672257511488],
-[-22.487176722014723, -44.53693299825759],
-[-22.486776264458264, -44.53721849833907],
-[-22.486676454201298, -44.53706943988472],
-[-22.487114212624817, -44.53674970934726],
-[-22.487645450985507, -44.53657030709373],
-[-22.487770497958074, -44.5364104003999],
-[-22.488006926312046, -44.536365605212985],
-[-22.48821775541626, -44.53645519867187],
-[-22.488241286909652, -44.53645519849039],
-[-22.488476601062555, -44.53641686907708],
-[-22.48857304959472, -44.53600757079865],
-[-22.488597325337707, -44.53599462982132],
-[-22.488597126599295, -44.535572528627426],
-[-22.48862632083402, -44.53556629190863],
-[-22.488626321101282, -44.53534246508779],
-[-22.48881395971028, -44.535304859951296],
-[-22.48915139557624, -44.535944961705205],
-[-22.48921501020765, -44.53629581865389]],
-#P1E-B
-[[-22.486778520115617, -44.537278476245895],
-[-22.48559616597879, -44.538019642740565],
-[-22.484499657607106, -44.538795533316026],
-[-22.483965503003756, -44.53931204893238],
-[-22.48375702841266, -44.53962088851651],
-[-22.483608567708938, -44.53986039733368],
-[-22.483484248982972, -44.5395678148144],
-[-22.48372288851175, -44.53900692188699],
-[-22.484126054394405, -44.53854457279756],
-[-22.48488933951751, -44.53812494767339],
-[-22.485402396503503, -44.53774687826876],
-[-22.486025436065763, -44.53727818444819],
-[-22.486521678238965, -44.5371897784923],
-[-22.48670248404335, -44.53706256905197]],
-# P1E-C
-[[-22.48688243657907, -44.53818451182176],
-[-22.48681126576883, -44.537528960222275],
-[-22.486899266919817, -44.5373808462416],
-[-22.486838257269778, -44.53727469711381],
-[-22.484536402494797, -44.53886914384722],
-[-22.48610978450587, -44.53856900543562],
-[-22.486197957702615, -44.538888518656044],
-[-22.486316890203167, -44.53917131319824],
-[-22.486552961923554, -44.53916806967983],
-[-22.486708920906374, -44.53909340920772],
-[-22.486669437714838, -44.538875726014794],
-[-22.486500957480317, -44.53894576916969],
-[-22.486500157095893, -44.53893949492973],
-[-22.486440750581576, -44.53828906734141],
-[-22.48691227076902, -44.53818644472393],
-[-22.486894045943245, -44.53818277411627]],
-# P1E-D
-[[-22.48697601918495, -44.541637032359176],
-[-22.486704085037264, -44.53912328668172],
-[-22.48632473613282, -44.5391901862012],
-[-22.486258964818095, -44.53890865083509],
-[-22.485951379022218, -44.5386850819178],
-[-22.484966541840002, -44.53885408562257],
-[-22.484955411667798, -44.53884496726523],
-[-22.484714717223433, -44.5389888456226],
-[-22.48475779712686, -44.53971574662274],
-[-22.4854701366647, -44.541313073641376],
-[-22.485752372877478, -44.54195988661638],
-[-22.487006639604125, -44.54164314642328]],
-# P1E-E
-[[-22.484602823136807, -44.53890159974378],
-[-22.484698153577888, -44.53975054978894],
-[-22.484693952822806, -44.53995487877751],
-[-22.48395847243147, -44.54005307942218],
-[-22.483813795783753, -44.53972266827471],
-[-22.484235425950335, -44.5391480040603],
-[-22.484614304782628, -44.538921999765925]],
-# P1E-F
-[[-22.484661161978778, -44.5399082503027],
-[-22.486055958591997, -44.543122965723605],
-[-22.485886503968832, -44.54333021586312],
-[-22.48457797670264, -44.54027552891268],
-[-22.48401397936359, -44.5402501068354],
-[-22.483942041673636, -44.54002282246162],
-[-22.484650212099073, -44.539940108608384]],
-# P1E-G
-[[-22.48609986921309, -44.543104468700406],
-[-22.489512283685496, -44.542623477875345],
-[-22.489802554814727, -44.54294138583691],
-[-22.485932030793357, -44.54341178113289]],
-
-#P1E-H
-[[-22.489506776184875, -44.542570101790176],
-[-22.489482166345464, -44.54140843410614],
-[-22.48567259641259, -44.5419183654847],
-[-22.48618151138955, -44.54301440264202],
-[-22.48951059429305, -44.542524561141]],
-
-#P2E-A
-[[-22.489739199858068, -44.54264213712882],
-[-22.49213426843662, -44.5423628988837],
-[-22.492195139413383, -44.54264457904935],
-[-22.48976942685133, -44.542863879012174]],
-
-#P2E-B
-[[-22.48974832282247, -44.54265010255431],
-[-22.49213467465016, -44.542381315777014],
-[-22.491937362175246, -44.54104976255741],
-[-22.49153823806687, -44.54101433336423],
-[-22.491271044558292, -44.54118985692881],
-[-22.48958088902175, -44.54147810558138],
-[-22.489715346303935, -44.54265397134658]],
-
-#P2E-C
-[[-22.49260490804964, -44.542706295356034],
-[-22.492423477925776, -44.54104602256193],
-[-22.49212250370988, -44.54049357547612],
-[-22.491720423807692, -44.54064920980403],
-[-22.48946078111849, -44.54078817237485],
-[-22.489562820101526, -44.541380915573],
-[-22.491326964221045, -44.5411560635184],
-[-22.49148789448892, -44.541001779496845],
-[-22.49184311157794, -44.540915195782496],
-[-22.49200003594716, -44.54098719515164],
-[-22.49211525277076, -44.542428165484786],
-[-22.492141287578924, -44.54269579456053],
-[-22.49260395391111, -44.54267142849747]],
-
-#P2E-D
-[[-22.49225291087156, -44.54039883962764],
-[-22.49085172024787, -44.538006282285565],
-[-22.490447955070753, -44.538225536506296],
-[-22.49076036650574, -44.540762078520636],
-[-22.491659425691658, -44.54073022173363],
-[-22.492210471461373, -44.540394616973366]],
-
-#P2E-E
-[[-22.49063652198091, -44.540771984430904],
-[-22.490465906187268, -44.538210955013284],
-[-22.490808050705013, -44.53798899956388],
-[-22.490579220894613, -44.5374255588925],
-[-22.489238394653693, -44.538339437102586],
-[-22.489483388818858, -44.54102416842607],
-[-22.490695816127033, -44.540816803893094]],
-
-# P2E-F
-[[-22.490582199815204, -44.537515988606955],
-[-22.490510053950015, -44.53735543645934],
-[-22.489244277805007, -44.53808646404648],
-[-22.489286688220872, -44.53834793186706]],
-
-#P2E-G
-[[-22.489231995840925, -44.53849576033275],
-[-22.489431929274385, -44.541407323503535],
-[-22.486984593188556, -44.54171635387721],
-[-22.486818984791054, -44.54057236945579],
-[-22.488980427932432, -44.540375866873546],
-[-22.48894244349655, -44.538558623451614],
-[-22.48928953670181, -44.53847812603966]],
-
-#P2E-H
-
-[[-22.48830975972828, -44.538268895916225],
-[-22.48818731780736, -44.53691499718957],
-[-22.487529357980435, -44.5369444540363],
-[-22.486849196606503, -44.53742611971208],
-[-22.48690838569744, -44.53841356194507],
-[-22.48831961907706, -44.53824261787658]],
-
-#P2E-I
-
-[[-22.489162682536538, -44.5373812185006],
-[-22.489263391704803, -44.538442154278336],
-[-22.486982532724888, -44.5387764800269],
-[-22.48693361070899, -44.53843687883168],
-[-22.48833313396873, -44.53826690597478],
-[-22.48824093109627, -44.537485354095296],
-[-22.48920596535845, -44.53732618908306]],
-
-#P1W-A
-
-[[-22.49188481164542, -44.54492881597283],
-[-22.49168978314756, -44.54327021295797],
-[-22.490050578650262, -44.54346665718088],
-[-22.490047279634965, -44.543729084359676],
-[-22.48942328165687, -44.543817377936556],
-[-22.48950198061829, -44.54469806287458],
-[-22.489543394029276, -44.54512739614259],
-[-22.490298084836127, -44.54497637202184],
-[-22.4903827277616, -44.545411115500535],
-[-22.491938133673088, -44.544981009025584]],
-
-# P1W-B
-
-[[-22.491793494179742, -44.54333006639081],
-[-22.49175896478048, -44.543137023535714],
-[-22.491691913386347, -44.54246142647005],
-[-22.49011071388118, -44.5426402990202],
-[-22.49019239204128, -44.542888638218166],
-[-22.48924950293641, -44.54300477552774],
-[-22.489386194969867, -44.543777253993106],
-[-22.49002882637237, -44.543759074017565],
-[-22.490016904203472, -44.543487244461105],
-[-22.491787454824372, -44.543406693312996],
-[-22.491714977192114, -44.54312731877908]],
-
-# P2W-A
-
-[[-22.48927971330925, -44.54383582190185],
-[-22.48925410370876, -44.54277624102222],
-[-22.487316589210177, -44.543029016245534],
-[-22.487476184361046, -44.54414818554068],
-[-22.48931513883151, -44.54390731779081]],
-
-# P2W-B
-
-[[-22.48951537932026, -44.54581046160085],
-[-22.48923186458569, -44.54391751049694],
-[-22.487580939290858, -44.54421115738727],
-[-22.487608020206522, -44.5454062679654],
-[-22.48811531651974, -44.54596674558749],
-[-22.48957568780795, -44.545848848019595]],
-
-#P3W-A
-
-[[-22.487334004677034, -44.543194182325614],
-[-22.487325678353614, -44.54298222223566],
-[-22.486029730409598, -44.543187744798864],
-[-22.485113340818575, -44.54366456323263],
-[-22.48543566673846, -44.54409501276961],
-[-22.48689243281423, -44.543263548422445],
-[-22.4872723008852, -44.54314097792242]],
-
-# P3W-B
-
-[[-22.48538385902925, -44.54413176302442],
-[-22.485258060911292, -44.54370748986745],
-[-22.48422384283112, -44.544289337335556],
-[-22.484406551260154, -44.54464585525061]],
-
-# P3W-C
-
-[[-22.487360445138908, -44.54387293629455],
-[-22.487301312122522, -44.54341433051533],
-[-22.48719150355547, -44.54331911705672],
-[-22.48699566381282, -44.543311570350575],
-[-22.48579857278907, -44.543981595931164],
-[-22.486087492735184, -44.544545678058554],
-[-22.486300346721176, -44.544442876988434],
-[-22.48619402715585, -44.54421377753698],
-[-22.48683574429521, -44.54387367049419],
-[-22.486953277176976, -44.54392941393477],
-[-22.4873631778269, -44.54384067598701]],
-
-# P3W-D
-[[-22.487457931582497, -44.54448540233586],
-[-22.487385163105113, -44.543882637697514],
-[-22.48697269386013, -44.54394615170048],
-[-22.48686966167768, -44.54380583706863],
-[-22.486174497025246, -44.54413967598955],
-[-22.48630166179837, -44.54445545763214],
-[-22.486093966208628, -44.544551254648496],
-[-22.486314676741017, -44.5450848602224],
-[-22.48744371280331, -44.54445546956461],
-[-22.487377417412542, -44.54386444671886]],
-
-# P3W-E
-[[-22.4876033703913, -44.54558023864001],
-[-22.487468421897407, -44.54445839208224],
-[-22.48624757432335, -44.545122841836005],
-[-22.486441257463692, -44.54544467738457],
-[-22.48654340352991, -44.54536986351283],
-[-22.486391211041614, -44.54512232450107],
-[-22.48695416042601, -44.544818283625744],
-[-22.48705856847858, -44.54498741520898],
-[-22.48683010186261, -44.5451300727875],
-[-22.48716142401928, -44.5457795760574],
-[-22.4875971442698, -44.54558784696875],
-[-22.487479667426513, -44.54447461871776]],
-
-# P3W-F
-[[-22.48632809326321, -44.54532537724833],
-[-22.485989034063785, -44.544449382373585],
-[-22.485693286400835, -44.5446067225644],
-[-22.486118346450265, -44.545459319093055]],
-
-# P3W-G
-[[-22.485687356083183, -44.54455006665535],
-[-22.485472949622284, -44.544142468013135],
-[-22.48465956338426, -44.54463149506414],
-[-22.484840030785257, -44.54506188013824]],
-
-# P3W-H
-[[-22.486509688915916, -44.54537283397347],
-[-22.48637099684035, -44.54517316287623],
-[-22.48628696468042, -44.54515798189869],
-[-22.485986195625326, -44.54532235511452],
-[-22.485593839919645, -44.545568071788324],
-[-22.485278879855798, -44.54570214829912],
-[-22.484962158125267, -44.54498922415829],
-[-22.484849002031723, -44.54503489802833],
-[-22.4852693657338, -44.546002500666965],
-[-22.485711426092024, -44.545846763127685],
-[-22.486314859912422, -44.54553691945306],
-[-22.486498720206026, -44.545380553230125]],
-
-# P4W-A
-
-[[-22.486345452457172, -44.54583052230568],
-[-22.486039325645688, -44.54598858907717],
-[-22.485889604891433, -44.545742839256356],
-[-22.48566227346259, -44.54589591071292],
-[-22.485725776008508, -44.54608482857579],
-[-22.485546710326897, -44.54615034324484],
-[-22.485433315025823, -44.54601290594824],
-[-22.48521072927347, -44.54614386241613],
-[-22.484661486070237, -44.544830250057736],
-[-22.484375203965676, -44.54498552181381],
-[-22.48478770408721, -44.545811776735675],
-[-22.48558823309536, -44.54698209864419],
-[-22.486437931128986, -44.54655328217612],
-[-22.486378704973866, -44.546417902194456],
-[-22.486566401863683, -44.54625970949479],
-[-22.486339850926463, -44.545803481438625]],
-
-# P4W-B
-
-[[-22.48774500733739, -44.54795344380928],
-[-22.487632366654854, -44.547340046313685],
-[-22.487469380341288, -44.54706443718995],
-[-22.487035797616983, -44.547275933019534],
-[-22.486731186769415, -44.54659468649175],
-[-22.48704684160353, -44.54639112676571],
-[-22.48693453867775, -44.54625933411809],
-[-22.485658737788103, -44.54700117450361],
-[-22.48627493938175, -44.547939500065446]],
-
-# P4W-C
-[[-22.48774741516519, -44.54796356522182],
-[-22.487686865772517, -44.547297850424414],
-[-22.487620469613788, -44.5470376484388],
-[-22.487922269036208, -44.54683764377414],
-[-22.487725470748245, -44.54647041972388],
-[-22.48778262807537, -44.54627832627356],
-[-22.48874993933501, -44.546049695241],
-[-22.48885765434089, -44.54693629019929],
-[-22.488567818816094, -44.546961305928775],
-[-22.488731255392143, -44.547903878599364],
-[-22.487774283450026, -44.54796424556957]],
-
-# P4W-D
-
-[[-22.489523944563167, -44.54598697464894],
-[-22.48966518204239, -44.54650139105032],
-[-22.48989556813947, -44.546907548930555],
-[-22.490384870749192, -44.54766326348205],
-[-22.490407110657074, -44.5477730519351],
-[-22.489533274882476, -44.547790630822064],
-[-22.48952482173048, -44.54718272713198],
-[-22.489533470151702, -44.54597235843246]],
-
-# P5W-A
-
-[[-22.48969709096307, -44.54596761231146],
-[-22.4897393408423, -44.54623005207035],
-[-22.489947210109623, -44.54653318258873],
-[-22.490062895913315, -44.546954143602576],
-[-22.49047888474815, -44.54759476494059],
-[-22.490620464363992, -44.5476957900116],
-[-22.491464821293977, -44.547384304387364],
-[-22.4925751897925, -44.547163670098705],
-[-22.49385930076751, -44.5471287056881],
-[-22.49356413354255, -44.5469973405924],
-[-22.491662234232784, -44.546506147681036],
-[-22.489676826180975, -44.54599063243632]],
-
-# P5W-B
-
-[[-22.490524384040537, -44.54606256141668],
-[-22.493988182137866, -44.54709838222009],
-[-22.494202183951206, -44.54694907282749],
-[-22.494678588809432, -44.54657710798844],
-[-22.494819938209805, -44.54578423967169],
-[-22.494575310438297, -44.545023680472056],
-[-22.493889050013784, -44.54490691918464],
-[-22.49348979298541, -44.54516845097942],
-[-22.49309959896442, -44.54597203777485],
-[-22.492727515074066, -44.54622284619936],
-[-22.492276047064742, -44.54606203759653],
-[-22.491134478157377, -44.54583651744892],
-[-22.490955854230524, -44.54601987414672],
-[-22.490493142901922, -44.546087814604725]]]
-                # Substitua com coordenadas reais
-
-                m = folium.Map(location=[-22.4882, -44.5424], zoom_start=16.45)
-
-                data = []
-                for i in range(35):
-                    row = df[df["area"] == i + 1]
-                    if not row.empty and area_coords[i]:
-                        data_corte = row.iloc[0]["data_corte"].date()
-                        days_since_cut = (datetime.now().date() - data_corte).days
-                        if days_since_cut >= min_days:
-                            nome_area = st.session_state.area_info[i]["nome"]
-                            maquina = st.session_state.area_info[i]["maquina"]
-                            chuvoso = st.session_state.area_info[i]["periodo_chuvoso"]
-                            seco = st.session_state.area_info[i]["periodo_seco"]
-                            status = get_status(days_since_cut, chuvoso, seco)
-                            folium.Polygon(
-                                area_coords[i],
-                                color=get_color(data_corte, default_colors),
-                                fill=True,
-                                fill_opacity=0.7,
-                                popup=f"{nome_area}<br>{days_since_cut} dias desde o corte<br>Máquina: {maquina}<br>Status: {status}"
-                            ).add_to(m)
-                            data.append([nome_area, maquina, days_since_cut, chuvoso, seco, status, data_corte.strftime('%B')])
-
-                # Legenda
-                legend_html = '''
-                <div style='position: fixed; bottom: 50px; left: 50px; width: 250px; height: auto;
-                background-color: white; z-index:9999; font-size:14px;
-                border:2px solid grey; border-radius:5px; padding: 10px;'>
-                <b>Legenda - Dias desde o corte</b><br>
-                '''
-                for days in range(0, st.session_state.get("max_days", 90) + 1, 15):
-                    color = default_colors.get(days, st.session_state.get("default_color", "#C5F5C5"))
-                    legend_html += f"<i style='background:{color};width:18px;height:18px;float:left;margin-right:8px;opacity:0.7;'></i>{days} dias<br>"
-                legend_html += "</div>"
-
-                legend = MacroElement()
-                legend._template = Template(legend_html)
-                m.get_root().add_child(legend)
-
-                if data:
-                    df_prioridade = pd.DataFrame(data, columns=[
-                        "Nome da Área", "Máquina", "Dias desde o corte",
-                        "Periodicidade Chuvoso", "Periodicidade Seco", "Status", "Mês do Último Corte"
-                    ])
-                    df_prioridade = df_prioridade.sort_values(by="Dias desde o corte", ascending=False)
-
-                    st.markdown("### 📋 Ordem de Prioridade de Corte")
-                    mes_atual = datetime.now().strftime('%B')
-                    periodo_atual = "Chuvoso" if mes_atual in st.session_state.meses_chuvosos else "Seco"
-                    st.markdown(f"Atualmente, estamos em período: **{periodo_atual}**")
-
-                    def highlight_status(val):
-                        if val == "Vencido":
-                            return "background-color: red; color: black"
-                        return ""
-
-                    styled_df = df_prioridade.style.applymap(highlight_status, subset=["Status"])
-                    st.dataframe(styled_df, use_container_width=True)
-
-                    folium_static(m, width=1400, height=800)
-
-                    if data and st.button("Exportar Relatório"):
-                        df_export = pd.DataFrame(data, columns=[
-                            "Nome da Área", "Máquina", "Dias desde o corte",
-                            "Periodicidade Chuvoso", "Periodicidade Seco", "Status", "Mês do Último Corte"
-                        ])
-                        df_export.to_csv("relatorio_corte_vegetacao.csv", index=False)
-                        st.success("Relatório exportado com sucesso!")
+                df = None
+    elif not historico.empty:
+        st.caption(f"Exibindo o histórico salvo do site ({len(historico)} cortes).")
+        df = historico
+
+    if df is not None:
+        min_days = st.slider("Mostrar áreas com no mínimo X dias desde o corte", 0, st.session_state.get("max_days", 90), 0)
+
+        site = carregar_json_site(site_id, "site.json")
+        geometria = carregar_geometria(site_id)
+        m = folium.Map(location=site.get("centro") or centro_geometria(geometria), zoom_start=site.get("zoom", 16))
+        if not geometria:
+            st.info("Este site não tem polígonos cadastrados em geometria.json; as áreas aparecem apenas na tabela.")
+
+        # Último corte de cada área
+        ultimos = df.groupby("area")["data_corte"].max()
+        usar_crescimento = modelo_crescimento_ativo(clima)
+        if usar_crescimento:
+            indices = pd.Series(indice_crescimento(clima, ultimos), index=ultimos.index)
+            limiares = pd.Series(limiares_crescimento(ultimos.index, area_info), index=ultimos.index)
+            status_modelo = pd.Series(status_crescimento(indices, limiares), index=ultimos.index)
+            cobertos = pd.Series(cobertura_clima(clima, ultimos), index=ultimos.index)
+        sem_cobertura = []
+
+        data = []
+        for area, ultimo_corte in ultimos.items():
+            i = int(area) - 1
+            if 0 <= i < len(area_info):
+                data_corte = ultimo_corte.date()
+                days_since_cut = (datetime.now().date() - data_corte).days
+                if days_since_cut >= min_days:
+                    nome_area = area_info[i]["nome"]
+                    maquina = area_info[i]["maquina"]
+                    chuvoso = area_info[i]["periodo_chuvoso"]
+                    seco = area_info[i]["periodo_seco"]
+                    popup = f"{nome_area}<br>{days_since_cut} dias desde o corte<br>Máquina: {maquina}"
+                    if usar_crescimento and cobertos[area]:
+                        status = status_modelo[area]
+                        popup += f"<br>Índice de crescimento: {indices[area]:.0f} / {limiares[area]}"
+                    else:
+                        status = get_status(days_since_cut, chuvoso, seco)
+                        if usar_crescimento:
+                            sem_cobertura.append(nome_area)
+                    # Áreas sem polígono entram só na tabela de prioridade
+                    if geometria.get(area):
+                        folium.Polygon(
+                            geometria[area],
+                            color=get_color(data_corte, default_colors),
+                            fill=True,
+                            fill_opacity=0.7,
+                            popup=f"{popup}<br>Status: {status}"
+                        ).add_to(m)
+                    data.append([nome_area, maquina, days_since_cut, chuvoso, seco, status, data_corte.strftime('%B')])
+
+        # Legenda
+        legend_html = '''
+        <div style='position: fixed; bottom: 50px; left: 50px; width: 250px; height: auto;
+        background-color: white; z-index:9999; font-size:14px;
+        border:2px solid grey; border-radius:5px; padding: 10px;'>
+        <b>Legenda - Dias desde o corte</b><br>
+        '''
+        for days in range(0, st.session_state.get("max_days", 90) + 1, 15):
+            color = default_colors.get(days, st.session_state.get("default_color", "#C5F5C5"))
+            legend_html += f"<i style='background:{color};width:18px;height:18px;float:left;margin-right:8px;opacity:0.7;'></i>{days} dias<br>"
+        legend_html += "</div>"
+
+        legend = MacroElement()
+        legend._template = Template(legend_html)
+        m.get_root().add_child(legend)
+
+        if sem_cobertura:
+            st.warning(
+                f"A série climática não cobre o período desde o último corte de {len(sem_cobertura)} área(s); "
+                f"o status delas usa os meses chuvosos: {', '.join(sem_cobertura[:20])}"
+                + (" …" if len(sem_cobertura) > 20 else "")
+            )
+
+        if data:
+            df_prioridade = pd.DataFrame(data, columns=[
+                "Nome da Área", "Máquina", "Dias desde o corte",
+                "Periodicidade Chuvoso", "Periodicidade Seco", "Status", "Mês do Último Corte"
+            ])
+            df_prioridade = df_prioridade.sort_values(by="Dias desde o corte", ascending=False)
+
+            st.markdown("### 📋 Ordem de Prioridade de Corte")
+            mes_atual = datetime.now().strftime('%B')
+            periodo_atual = "Chuvoso" if mes_atual in st.session_state.meses_chuvosos else "Seco"
+            st.markdown(f"Atualmente, estamos em período: **{periodo_atual}**")
+            if usar_crescimento:
+                st.markdown("Status calculado pelo **índice de crescimento acumulado** desde o último corte.")
+            elif st.session_state.modelo_periodicidade == MODELO_CRESCIMENTO:
+                st.warning("Modelo de crescimento selecionado sem dados climáticos; usando os meses chuvosos.")
+
+            def highlight_status(val):
+                if val == "Vencido":
+                    return "background-color: red; color: black"
+                return ""
+
+            styled_df = df_prioridade.style.applymap(highlight_status, subset=["Status"])
+            st.dataframe(styled_df, use_container_width=True)
+
+            if geometria:
+                folium_static(m, width=1400, height=800)
+
+            if data and st.button("Exportar Relatório"):
+                df_export = pd.DataFrame(data, columns=[
+                    "Nome da Área", "Máquina", "Dias desde o corte",
+                    "Periodicidade Chuvoso", "Periodicidade Seco", "Status", "Mês do Último Corte"
+                ])
+                df_export.to_csv("relatorio_corte_vegetacao.csv", index=False)
+                st.success("Relatório exportado com sucesso!")
 
 # Página do histórico de cortes
 elif page == "Histórico de Cortes":
     st.title("📄 Histórico de Cortes Realizados")
 
+    historico = carregar_historico(site_id)
     uploaded_file = st.file_uploader("📤 Envie o arquivo CSV com as datas de corte", type="csv", key="historico")
+    df = None
     if uploaded_file is not None:
         df = pd.read_csv(uploaded_file)
         if "area" not in df.columns or "data_corte" not in df.columns:
             st.error("CSV inválido. As colunas devem ser: 'area' e 'data_corte'")
+            df = None
         else:
+            df = normalizar_areas(df)
             df['data_corte'] = pd.to_datetime(df['data_corte'], dayfirst=True, errors='coerce')
             df = df.dropna(subset=["data_corte"])
-            # Expandir todos os registros do CSV em vez de apenas o primeiro por área
-            df["Data do Corte"] = pd.to_datetime(df["data_corte"], dayfirst=True, errors="coerce")
-            df = df.dropna(subset=["Data do Corte"])
-
-            # Mapear nomes e máquinas das áreas
-            area_info = {i + 1: st.session_state.area_info[i] for i in range(35)}
-            df["Área"] = df["area"].map(lambda x: area_info.get(x, {}).get("nome", f"Área {x}"))
-            df["Máquina"] = df["area"].map(lambda x: area_info.get(x, {}).get("maquina", "Desconhecida"))
-            df["Dias desde o Corte"] = (datetime.now() - df["Data do Corte"]).dt.days
-            df["Status"] = df.apply(lambda row: get_status(
-                row["Dias desde o Corte"],
-                area_info.get(row["area"], {}).get("periodo_chuvoso", 30),
-                area_info.get(row["area"], {}).get("periodo_seco", 60)
-            ), axis=1)
-            df["Período"] = "Chuvoso" if datetime.now().month in [mes_para_numero(m) for m in
-                                                                  st.session_state.meses_chuvosos] else "Seco"
-
-            df_hist = df[["Área", "Data do Corte", "Máquina", "Dias desde o Corte", "Status", "Período"]]
-
-            styled_hist = df_hist.style.set_properties(**{'text-align': 'center'})
-            st.dataframe(styled_hist, use_container_width=True)
-
-            df_hist["Data do Corte"] = pd.to_datetime(df_hist["Data do Corte"], dayfirst=True, errors="coerce")
-
-            # Adicionar filtros
-            st.markdown("### Filtros")
-            areas_selecionadas = st.multiselect(
-                "Selecione as Áreas",
-                options=df_hist["Área"].unique(),
-                default=df_hist["Área"].unique()
-            )
-
-            data_inicio, data_fim = st.date_input(
-                "Selecione o intervalo de datas",
-                [df_hist["Data do Corte"].min(), df_hist["Data do Corte"].max()]
-            )
-
-            # Filtrar dados
-            df_hist_filtrado = df_hist[
-                (df_hist["Área"].isin(areas_selecionadas)) &
-                (pd.to_datetime(df_hist["Data do Corte"], format="%d/%m/%Y") >= pd.to_datetime(data_inicio)) &
-                (pd.to_datetime(df_hist["Data do Corte"], format="%d/%m/%Y") <= pd.to_datetime(data_fim))
-                ]
-
-            # Converter coluna de data para datetime
-            df_hist["Data do Corte"] = pd.to_datetime(df_hist["Data do Corte"], format="%d/%m/%Y")
+            if st.button("💾 Salvar no histórico do site"):
+                salvar_historico(site_id, df, st.session_state.area_info)
+                st.success("Cortes salvos no histórico do site!")
+    elif not historico.empty:
+        st.caption(f"Exibindo o histórico salvo do site ({len(historico)} cortes).")
+        df = historico.copy()
+
+    if df is not None:
+        # Expandir todos os registros do CSV em vez de apenas o primeiro por área
+        df["Data do Corte"] = pd.to_datetime(df["data_corte"], dayfirst=True, errors="coerce")
+        df = df.dropna(subset=["Data do Corte"])
+
+        # Mapear nomes e máquinas das áreas
+        area_info = {i + 1: area for i, area in enumerate(st.session_state.area_info)}
+        df["Área"] = df["area"].map(lambda x: area_info.get(x, {}).get("nome", f"Área {x}"))
+        df["Máquina"] = df["area"].map(lambda x: area_info.get(x, {}).get("maquina", "Desconhecida"))
+        df["Dias desde o Corte"] = (datetime.now() - df["Data do Corte"]).dt.days
+        df["Status"] = df.apply(lambda row: get_status(
+            row["Dias desde o Corte"],
+            area_info.get(row["area"], {}).get("periodo_chuvoso", 30),
+            area_info.get(row["area"], {}).get("periodo_seco", 60)
+        ), axis=1)
+        if modelo_crescimento_ativo(clima):
+            # Cortes fora da série climática mantêm o status pelos meses chuvosos
+            cobertos = cobertura_clima(clima, df["Data do Corte"])
+            indices = indice_crescimento(clima, df["Data do Corte"])
+            limiares = limiares_crescimento(df["area"], st.session_state.area_info)
+            df.loc[cobertos, "Status"] = status_crescimento(indices, limiares)[cobertos]
+            if not cobertos.all():
+                st.warning(
+                    f"{(~cobertos).sum()} corte(s) fora do período da série climática "
+                    "têm o status calculado pelos meses chuvosos."
+                )
+        df["Período"] = "Chuvoso" if datetime.now().month in [mes_para_numero(m) for m in
+                                                              st.session_state.meses_chuvosos] else "Seco"
+
+        df_hist = df[["Área", "Data do Corte", "Máquina", "Dias desde o Corte", "Status", "Período"]]
+
+        styled_hist = df_hist.style.set_properties(**{'text-align': 'center'})
+        st.dataframe(styled_hist, use_container_width=True)
+
+        df_hist["Data do Corte"] = pd.to_datetime(df_hist["Data do Corte"], dayfirst=True, errors="coerce")
+
+        # Adicionar filtros
+        st.markdown("### Filtros")
+        areas_selecionadas = st.multiselect(
+            "Selecione as Áreas",
+            options=df_hist["Área"].unique(),
+            default=df_hist["Área"].unique()
+        )
+
+        data_inicio, data_fim = st.date_input(
+            "Selecione o intervalo de datas",
+            [df_hist["Data do Corte"].min(), df_hist["Data do Corte"].max()]
+        )
+
+        # Filtrar dados
+        df_hist_filtrado = df_hist[
+            (df_hist["Área"].isin(areas_selecionadas)) &
+            (pd.to_datetime(df_hist["Data do Corte"], format="%d/%m/%Y") >= pd.to_datetime(data_inicio)) &
+            (pd.to_datetime(df_hist["Data do Corte"], format="%d/%m/%Y") <= pd.to_datetime(data_fim))
+            ]
+
+        # Converter coluna de data para datetime
+        df_hist["Data do Corte"] = pd.to_datetime(df_hist["Data do Corte"], format="%d/%m/%Y")
 
 
 # Adicionar gráfico de linha do tempo abaixo da tabela
-            if not df_hist_filtrado.empty:
-                st.markdown("### 📈 Histórico de Cortes por Área (Dispersão)")
-                fig, ax = plt.subplots(figsize=(12, 8))
-                for area in df_hist_filtrado["Área"].unique():
-                    area_data = df_hist_filtrado[df_hist_filtrado["Área"] == area]
-                    ax.scatter(area_data["Data do Corte"], [area] * len(area_data), label=f'Área {area}')
-
-                ax.set_xlabel("Data de Corte")
-                ax.set_ylabel("Área")
-                ax.set_title("Quantidade de Cortes Realizados ao Longo do Tempo por Área")
-                ax.grid(True)
-                ax.legend(title="Áreas", bbox_to_anchor=(1.05, 1), loc='upper left')
-                plt.xticks(rotation=45)
-                plt.tight_layout()
-                st.pyplot(fig)
+        if not df_hist_filtrado.empty:
+            st.markdown("### 📈 Histórico de Cortes por Área (Dispersão)")
+            fig, ax = plt.subplots(figsize=(12, 8))
+            for area in df_hist_filtrado["Área"].unique():
+                area_data = df_hist_filtrado[df_hist_filtrado["Área"] == area]
+                ax.scatter(area_data["Data do Corte"], [area] * len(area_data), label=f'Área {area}')
+
+            ax.set_xlabel("Data de Corte")
+            ax.set_ylabel("Área")
+            ax.set_title("Quantidade de Cortes Realizados ao Longo do Tempo por Área")
+            ax.grid(True)
+            ax.legend(title="Áreas", bbox_to_anchor=(1.05, 1), loc='upper left')
+            plt.xticks(rotation=45)
+            plt.tight_layout()
+            st.pyplot(fig)
+
+# Página de resumo entre sites: usa apenas o resumo.json pré-agregado de cada site
+elif page == "Resumo dos Sites":
+    st.title("🗺️ Resumo dos Sites")
+
+    hoje = datetime.now().strftime("%Y-%m-%d")
+    chuvoso = datetime.now().month in [mes_para_numero(m) for m in st.session_state.meses_chuvosos]
+    linhas = []
+    for s in sites:
+        resumo = carregar_json_site(s, "resumo.json")
+        if resumo is None:
+            resumo = atualizar_resumo(s, load_area_config(s) or [])
+        vencimentos = np.array(resumo["vencimentos_chuvoso" if chuvoso else "vencimentos_seco"], dtype=str)
+        vencidas = int(np.searchsorted(vencimentos, hoje))
+        linhas.append([
+            carregar_json_site(s, "site.json")["nome"], resumo["areas"], resumo["cortes"],
+            resumo["ultimo_corte"], vencidas, resumo["areas_com_corte"] - vencidas,
+            resumo["areas"] - resumo["areas_com_corte"]
+        ])
+
+    df_sites = pd.DataFrame(linhas, columns=[
+        "Site", "Áreas", "Cortes registrados", "Último corte", "Vencidas", "Em dia", "Sem registro"
+    ])
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Sites", len(df_sites))
+    col2.metric("Áreas", int(df_sites["Áreas"].sum()))
+    col3.metric("Áreas vencidas", int(df_sites["Vencidas"].sum()))
+    st.markdown(
+        f"Status pela periodicidade do período **{'Chuvoso' if chuvoso else 'Seco'}** (meses chuvosos), "
+        "a partir do histórico salvo de cada site."
+    )
+    if st.session_state.modelo_periodicidade == MODELO_CRESCIMENTO:
+        st.caption("O modelo de crescimento não é aplicado neste resumo; veja o mapa de cada site.")
+    st.dataframe(df_sites, use_container_width=True)